@@ -20,14 +20,14 @@ yasper.initialize()
 # Note that errors in the following statements will print "None" to the console
 # in addition to the errors, because we're not checking for None before printing
 # the results
-print(str(yasper.execute("add 2 4 6 8")))       # 20
-print(str(yasper.execute("addqwerty 2 4 6 8"))) # 20 [overcompletion]
-print(str(yasper.execute("addn 2 4 6 8")))      # n
-print(str(yasper.execute("addnfwef 2 4")))      # n [overcompletion]
-print(str(yasper.execute("ad 2 4 6 8")))        # Error [ambiguous]
-print(str(yasper.execute("subtract 20 3")))     # 17
-print(str(yasper.execute("s 20 3")))            # 17 [undercompletion]
-print(str(yasper.execute("subtract 20 3 5")))   # 17 [extra arguments are ignored]
-print(str(yasper.execute("subtract 20")))       # Error [too few arguments]
-print(str(yasper.execute("encourage")))         # You can do it!
-print(str(yasper.execute("yabusa")))            # Error [unexpected command]
\ No newline at end of file
+print(yasper.execute("add 2 4 6 8"))        # 20
+print(yasper.execute("addqwerty 2 4 6 8"))  # 20 [overcompletion]
+print(yasper.execute("addn 2 4 6 8"))       # n
+print(yasper.execute("addnfwef 2 4"))       # n [overcompletion]
+print(yasper.execute("ad 2 4 6 8"))         # Error [ambiguous]
+print(yasper.execute("subtract 20 3"))      # 17
+print(yasper.execute("s 20 3"))             # 17 [undercompletion]
+print(yasper.execute("subtract 20 3 5"))    # 17 [extra arguments are ignored]
+print(yasper.execute("subtract 20"))        # Error [too few arguments]
+print(yasper.execute("encourage"))          # You can do it!
+print(yasper.execute("yabusa"))             # Error [unexpected command]
\ No newline at end of file
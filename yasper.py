@@ -9,7 +9,7 @@
 #
 # Example:
 #   >>> yasper.registerFunction("add", lambda data: sum([int(x) for x in data]), -1)
-#   >>> print(str(yasper.execute("add 2 4 6 8")))
+#   >>> print(yasper.execute("add 2 4 6 8"))
 #   20
 #
 # Yasper's command parsing is robust. It is able to match both under-typed and
@@ -39,14 +39,15 @@
 #             <func1>: The actual function you are binding to the command
 #     <num_arguments>: The number of arguments your function takes
 #
-# After you've fed the parser all of your functions, you must initialize your parser.
+# After you've fed the parser all of your functions, you may initialize your parser.
 #   yaser.initialize()
 #
-# Initializing the parser causes it to build the command lookup tree so that it can
-# recognize all of the commands you've defined. Failing to initialize the parser will
-# cause your code to throw errors.
+# Initializing the parser causes it to build the command lookup table so that it can
+# recognize all of the commands you've defined. If you don't, the parser builds the
+# table the first time it needs it, and rebuilds it whenever another function is
+# registered.
 #
-# Once the parser is initialized, you can parse and execute any input string:
+# You can then parse and execute any input string:
 #   execute("input string")
 # 
 # The parser always interprets the first word as the command and all subsequent words
@@ -78,6 +79,9 @@
 #   * Allow the programmer to toggle under-matching and over-matching for 
 #     sensitive applications
 
+import re
+import sys
+
 
 class Yasper:
     """The parser imported by the programmer.
@@ -85,23 +89,27 @@ class Yasper:
     Public methods:
         __init__ -- Class constructor, takes no arguments.
         registerFunction -- Fully specifies a function to be used by the parser.
-        initialize -- Called after all functions are registered; builds command parser.
+        initialize -- Optionally called after all functions are registered; builds
+                      command parser ahead of the first execute.
         execute -- Called on any string the programmer wants to parse; may return a
                    value.
 
     Private methods:
-        callFunction -- "Physically" calls the function corresponding to the command
-                        with the data as an argument.
-        getCommand -- Begins the search for the command in the command search tree.
+        getCommand -- Looks up the command in the command prefix table.
 
     Private fields:
-        fdict -- The dictionary that matches a command(string) to its actual function
-                 code (first-class object).
-        ctree -- The search tree that matches a user-typed command to a real one.
+        fdict -- The dictionary that matches a command(string) to the dispatcher that
+                 "physically" calls its actual function code (first-class object).
+        ptable -- The dictionary that matches every prefix of every command to the
+                  one command it can complete to, or to None if it's ambiguous.
+                  None itself until the parser is initialized.
+        pregex -- The compiled pattern that matches the longest part of an input
+                  that is still a prefix of some command.
     """
     def __init__(self):
         """Initializes the parser with an empty function dictionary."""
         self.fdict = {}
+        self.ptable = None
         # TODO: Allow for shared data between functions
         # self.fdata = {}
 
@@ -114,30 +122,11 @@ class Yasper:
             nargs (int): The number of arguments the function expects to take.
         """
         # Function keys are case-insensitive; they're stored uppercase
-        self.fdict[s.upper()] = YasperFunction(f, nargs)
-
-    def callFunction(self, s, data):
-        """Call the function, corresponding to the command, with data as the argument.
-
-        Args:
-            s (str): The key for fdict that matches the function to be called.
-            data (list[str]): The arguments to be passed to the function.
-
-        Returns:
-            The return value of the function that is called.
-            Will always return None if the length of the list of arguments doesn't
-              match the number of arguments expected by the function.
-        """
-        expectednargs = self.fdict[s].nargs
-        if len(data) >= expectednargs:
-            # Ignore expectedargs if it's negative, which signals arbitrary length
-            if expectednargs >= 0:
-                data = data[:expectednargs]
-        else:
-            errorprint("Too few arguments for command " + s)
-            return
-        func = self.fdict[s].f
-        return (self.fdict[s].f)(data)
+        # and interned so that lookups can short-circuit on identity
+        s = sys.intern(s.upper())
+        self.fdict[s] = dispatcher(s, f, nargs)
+        # The lookup tables no longer cover every command
+        self.ptable = None
 
     def execute(self, inputstring):
         """Convert the string to be parsed into code to be executed.
@@ -151,25 +140,46 @@ class Yasper:
         """
         if inputstring == "":
             return
-        inputlist = inputstring.split()
+        inputlist = inputstring.split(None, 1)
         # The command is always the first entry in the string and is case-insensitive
-        command = self.getCommand(inputlist[0].upper())
-        if command is None:
-            errorprint("Invalid or ambiguous command")
-            return
+        command = sys.intern(inputlist[0].upper())
+        # Most commands are typed out in full, so check for an exact match first
+        dispatch = self.fdict.get(command)
+        if dispatch is None:
+            command = self.getCommand(command)
+            if command is None:
+                errorprint("Invalid or ambiguous command")
+                return
+            dispatch = self.fdict[command]
         # TODO: Incorporate #args to allow multiple commands at once
-        return self.callFunction(command, inputlist[1:])
+        argstring = inputlist[1] if len(inputlist) > 1 else ""
+        return dispatch(argstring)
 
     def initialize(self):
-        """Create the command search tree that will identify a command that was registered
-        with the parser. The keys from fdict are the commands.
+        """Create the command prefix table that will identify a command that was
+        registered with the parser. The keys from fdict are the commands.
         """
-        self.ctree = YasperCommandTree()
-        commands = self.fdict.keys()
-        self.ctree.initialize(commands)
+        self.ptable = {}
+        # Nested dictionaries of characters, used to build pregex
+        ctree = {}
+        for command in self.fdict:
+            node = ctree
+            for c in command:
+                node = node.setdefault(c, {})
+            for i in range(1, len(command) + 1):
+                prefix = sys.intern(command[:i])
+                # A prefix shared by two or more commands is ambiguous
+                if prefix in self.ptable:
+                    self.ptable[prefix] = None
+                else:
+                    self.ptable[prefix] = command
+        # A complete command always matches itself, even if it prefixes others
+        for command in self.fdict:
+            self.ptable[command] = command
+        self.pregex = re.compile("(?:" + prefixpattern(ctree) + ")?")
 
     def getCommand(self, s):
-        """Launche the search for a command in the command search tree.
+        """Look up a command in the command prefix table.
 
         Args:
             s (str): The input that needs to be matched to a command.
@@ -178,280 +188,69 @@ class Yasper:
             A key for fdict, if a matching command was found.
             None, if no matching command was found.
         """
-        return self.ctree.getCommand(s)
-
-class YasperFunction:
-    """A container that pairs together a function and its number of arguments."""
-    def __init__(self, f, nargs):
-        """Constructor.
-
-        Args:
-            f (func): The callable function.
-            nargs (int): The number of arguments f expects
-        """
-        self.f = f
-        self.nargs = nargs
-
-class YasperCommandTree:
-    """The command search tree.
-
-    Public methods:
-        __init__ -- Constructor, takes no arguments
-        initialize -- Constructs the tree from a list of commands; must be called
-                      before the tree can be used
-        getCommand -- Searches for a matching command given a string
-
-    Private fields:
-        root (YaserCommandTreeNode) -- The root of the search tree; corresponds
-                                       to the empty string
-    """
-    def __init__(self):
-        """Constructor. Creates the root node from which the tree will grow."""
-        self.root = YasperCommandTreeNode('')
-
-    def initialize(self, commandlist):
-        """Grow the tree from a list of commands.
-
-        Args:
-            commandlist (list[str]): A list of valid commands.
-        """
-        for command in commandlist:
-            self.root.addCommand(command)
-        # Nodes' maxdescendants fields must be updated after filling the tree
-        self.root.updateMaxDescendants()
-
-    def getCommand(self, s):
-        """Attempt to match an input string to a command in the tree.
-
-        Args:
-            s (str): The input that should be matched to a command.
+        if self.ptable is None:
+            self.initialize()
+        if s in self.ptable:
+            return self.ptable[s]
+        # The input is over-typed; find the longest part of it that still prefixes a
+        # command. Only a complete command can absorb the extra characters.
+        prefix = self.pregex.match(s).group()
+        if prefix in self.fdict:
+            return prefix
+        return None
 
-        Returns:
-            A valid command, if one could be matched to s.
-            None, if no valid command could be matched to s.
-        """
-        return self.root.searchCommand(s)
+def dispatcher(s, f, nargs):
+    """Bind a function to the argument handling its number of arguments calls for.
 
-class YasperCommandTreeNode:
-    """A node in the YasperCommandTree.
+    Args:
+        s (str): The command that calls the function, for error messages.
+        f (func): The function to be called on-command.
+        nargs (int): The number of arguments the function expects to take.
 
-    Public methods:
-        __init__ -- Constructor; takes a character that represents the node.
-        addCommand -- Adds a command string to the tree and marks it as valid.
-        searchCommand -- Given a string, finds a valid command in the tree.
-        updateMaxDescendants -- updates the maxdescendants field for this node
-                                and all children nodes.
-    
-    Private methods:
-        addchild -- Adds a child node that represents the given character.
-        getChild -- Returns a child node that represents the given character.
-        followTrail -- Follows/returns a deterministic path to a descendant leaf.
-    
-    Private fields:
-        c -- The character this node represents.
-        children -- The list of this node's children nodes.
-        terminal -- Boolean: does this node represent the final character in a 
-                   command?
-        maxdescendants -- That maximum number of children this node or any
-                          descendant node has.
+    Returns:
+        A function that takes the rest of the input after the command, splits it
+          into the arguments to be passed to f, and returns the return value of f.
+        That function will always return None if there are fewer arguments than
+          f expects.
     """
-    def __init__(self, c):
-        """Constructor; create a node that represents a character.
-
-        Also initializes all private fields to their default/empty values.
-
-        Args:
-            c (str): One-character string that this node will represent.
-        """
-        self.c = c
-        self.children = YasperCommandTreeNodeChildren()
-        self.terminal = False
-        self.maxdescendants = 0
-
-    def addChild(self, c):
-        """Add a new node that represents a character to this node's children.
-
-        Args:
-            c (str): The one-character string that should be represented.
-
-        Returns:
-            The node added."""
-        return self.children.addChild(c)
-
-    def getChild(self, c):
-        """Return a child node that represents the given character.
-
-        Args:
-            c (str): The one-character string that should be represented.
-
-        Returns:
-            A child node representing c, if one is found.
-            None, if no child node representing c is found.
-        """
-        return self.children.getChild(c)
-
-    def updateMaxDescendants(self):
-        """Recursively update this node and all children node with the maximum
-        number of children found for any node or its children nodes.
-
-        Returns:
-            This node's maximum descendants, an integer.
-        """
-        maxofchildren = 0
-        for child in self.children:
-            maxofchildren = max(maxofchildren, child.updateMaxDescendants())
-        self.maxdescendants = max(len(self.children), maxofchildren)
-        return self.maxdescendants
-
-    def addCommand(self, s):
-        """Recursively add a command to the subtree with this node as root.
-
-        Args:
-            s (str): The command to be added. Note that this is usually a partial
-                     command, characters from ascendants trimmed off.
-        """
-        # Empty string means this is the final character in the string
-        if s == "":
-            self.terminal = True
+    # A negative nargs signals arbitrary length
+    if nargs < 0:
+        return lambda argstring: f(argstring.split())
+    if nargs == 0:
+        return lambda argstring: f([])
+
+    def dispatch(argstring):
+        # Never split off more arguments than the function will use; anything past
+        # them is left unsplit in one extra entry that gets thrown out
+        data = argstring.split(None, nargs)
+        if len(data) < nargs:
+            errorprint("Too few arguments for command " + s)
             return
-        nextnode = self.getChild(s[0])
-        # If there is no child representing the next character in the command,
-        # create it. Then, continue adding the command starting at the next
-        # letter in the command.
-        if nextnode is None:
-            nextnode = self.addChild(s[0])
-        nextnode.addCommand(s[1:])
-
-    def searchCommand(self, s):
-        """Recursively search for a command in the subtree with this node as root.
+        if len(data) > nargs:
+            data.pop()
+        return f(data)
+    return dispatch
 
-        Args:
-            s (str): The command to be matched. Note that th is is usually a partial
-                     command, characters from ascendants trimmed off.
-
-        Returns:
-            A string matching the command found in this node or its descendants, if
-              one is found.
-            None, if no match is found in this command or its descendants.
-        """
-        # If the string is empty, return the current command or one that can be matched
-        # in descendants without any ambiguity
-        if s == "":
-            if self.terminal == True:
-                return self.c
-            if self.maxdescendants == 1:
-                return self.followTrail()
-            return None
-        nextnode = self.children.getChild(s[0])
-        # If the string continues but we can't find it in descendants, then return
-        # the current command if we've formed one, or return None if we haven't
-        if nextnode is None:
-            if self.terminal == True:
-                return self.c
-            return None
-        futuresearch = nextnode.searchCommand(s[1:])
-        # Only return a path if we found a match in our recursive search
-        if futuresearch is None:
-            return None
-        return self.c + futuresearch
-
-    def followTrail(self):
-        """Recursively follow and return the deepest deterministic path
-        through descendants.
-
-        Returns:
-            The determinist path (string) from this node through its descendants,
-              if there is one.
-            None if there is no deterministic path.
-        """
-        if len(self.children) == 1:
-            if self.terminal == True:
-                # Ambiguous because trail could stop here or continue
-                return None
-            subtrail = self.children[0].followTrail()
-            if subtrail is None:
-                # Subtrail is ambiguous
-                return None
-            return self.c + subtrail
-        return self.c
+def prefixpattern(ctree):
+    """Build a regular expression that greedily matches a path through ctree.
 
-class YasperCommandTreeNodeChildren:
-    """A list of YasperCommandTreeNodeChildren with some convenience methods.
+    Each character is followed by an optional group for its children, so the
+    pattern stops as deep in the tree as the input allows.
 
-    TODO: Refactor this to extend built-in list, if possible?
+    Args:
+        ctree (dict): Nested dictionaries mapping each character to the
+                      characters that can follow it.
 
-    Public methods:
-        __init__ -- Constructor; takes no arguments.
-        __len__ -- len() compatibility
-        __iter__ -- iterator compatibility
-        __getitem__ -- [index] compatibility
-        __setitem__ -- [index] compatibility
-        getCharacters -- Get a list of characters represented by nodes in the list.
-        addChild -- Creates and adds a node representing a character to the list.
-        getChild -- Lookup (return) a node that represents a given character.
-
-    Private fields:
-        childrenlist -- A list of YasperCommandTreeNode 
+    Returns:
+        The pattern (string), without an enclosing group.
     """
-    def __init__(self):
-        """Constructor; creates an empty list."""
-        self.childrenlist = []
-
-    def __len__(self):
-        """Return length of list field."""
-        return len(self.childrenlist)
-
-        """Return an iterator for list field."""
-    def __iter__(self):
-        return iter(self.childrenlist)
-
-    def __getitem__(self, index):
-        """Return item of list field at given index."""
-        return self.childrenlist[index]
-
-    def __setitem__(self, index, x):
-        """Set item of list field at given index."""
-        self.childrenlist[index] = x
-
-    def getCharacters(self):
-        """Convert the list field into the list of the characters it represents."""
-        charlist = []
-        for child in self.childrenlist:
-            charlist.append(child.c)
-        return charlist
-
-    def addChild(self, c):
-        """Add a new node to the list that represents the given character.
-
-        Args:
-            c (str): Single-character string that the new node represents.
-
-        Returns:
-            The node added, if no node representing that character was in the list.
-            The node in the list representing that character, if already present.
-        """
-        newnode = None
-        if c in self.getCharacters():
-            newnode = self.getChild(c)
+    alternatives = []
+    for c, children in ctree.items():
+        if children:
+            alternatives.append(re.escape(c) + "(?:" + prefixpattern(children) + ")?")
         else:
-            newnode = YasperCommandTreeNode(c)
-            self.childrenlist.append(newnode)
-        return newnode
-
-    def getChild(self, c):
-        """Check the nodes in the list to see if any represent the given character.
-
-        Args:
-            c (str): Single-character string to check if any nodes represent.
-
-        Returns:
-            The node representing c, if present in the list.
-            None, if no node in the list represents c.
-        """
-        for child in self.childrenlist:
-            if child.c == c:
-                return child
-        return None
+            alternatives.append(re.escape(c))
+    return "|".join(alternatives)
 
 def errorprint(es):
     """Print the error string 'es'."""